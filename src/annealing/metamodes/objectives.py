@@ -6,6 +6,50 @@ from enum import Enum
 import numba
 import numpy as np
 
+# Kernels are compiled eagerly for C-contiguous correlation matrices of each
+# supported dtype and int32 permutations. Sums are always accumulated in
+# float64. They release the GIL so solvers can run in threads.
+CORRELATION_DTYPES = ("float64", "float32")
+_JIT_OPTIONS = {"fastmath": True, "boundscheck": False, "cache": True, "nogil": True}
+
+
+def _signatures(signature: str) -> list[str]:
+    """Specialise a signature for each supported correlation matrix dtype."""
+    return [signature.format(corr=dtype) for dtype in CORRELATION_DTYPES]
+
+
+_SUM_SIG = _signatures(
+    "float64({corr}[:, ::1], int32[:, ::1], int64, int64, boolean)",
+)
+_MODE_SUMS_SIG = _signatures(
+    "float64[::1]({corr}[:, ::1], int32[:, ::1], int64, int64, boolean)",
+)
+_GENERATE_SIG = _signatures(
+    "{corr}[:, :, ::1]({corr}[:, ::1], int32[:, ::1], int64, int64)",
+)
+_DELTA_MODE_SUMS_SIG = _signatures(
+    "void({corr}[:, ::1], {corr}[:, ::1], int32[:, ::1], int64, int32[::1],"
+    " float64[::1], float64[::1], int64, int64)",
+)
+_DELTA_SIG = _signatures(
+    "float64({corr}[:, ::1], {corr}[:, ::1], int32[:, ::1], int32[:, ::1], int64,"
+    " float64[::1], float64[::1], int64, int64)",
+)
+_ANNEAL_SIG = _signatures(
+    "Tuple((float64, float64, int64))({corr}[:, ::1], {corr}[:, ::1],"
+    " int32[:, ::1], int32[:, ::1], float64[::1], float64, int32[:, ::1],"
+    " int32[:, ::1], float64, float64, int64, int64[::1], float64[::1],"
+    " int32[:, :, ::1], boolean)",
+)
+_SWEEP_MODE_SUMS_SIG = _signatures(
+    "void({corr}[:, ::1], {corr}[:, ::1], int32[:, ::1], int32[:, ::1],"
+    " float64[::1], float64[:, ::1], int64, int64)",
+)
+_SWEEP_SIG = _signatures(
+    "float64[::1]({corr}[:, ::1], {corr}[:, ::1], int32[:, ::1], int32[:, ::1],"
+    " float64[::1], float64[:, ::1], int64, int64)",
+)
+
 
 class Objective(Enum):
     """Encapsulate objective functions."""
@@ -35,20 +79,113 @@ class Objective(Enum):
             case _:
                 raise KeyError(undefined_msg)
 
+    @property
+    def delta_func(self: "Objective") -> Callable:
+        """Get the function for the change in the objective after one step.
+
+        Returns
+        -------
+        The delta objective function.
+
+        Raises
+        ------
+        KeyError: If the objective is not recognised.
+        """
+        undefined_msg = f"Objective not recognised. Choose from {self._names}"
+        match self:
+            case self.SUM:
+                return delta_sum_perms
+            case self.ABS_SUM:
+                return delta_abs_sum_perms
+            case _:
+                raise KeyError(undefined_msg)
+
+    @property
+    def anneal_func(self: "Objective") -> Callable:
+        """Get the function which takes a batch of single-channel steps.
+
+        Returns
+        -------
+        The batch annealing function.
+
+        Raises
+        ------
+        KeyError: If the objective is not recognised.
+        """
+        undefined_msg = f"Objective not recognised. Choose from {self._names}"
+        match self:
+            case self.SUM:
+                return anneal_sum_perms
+            case self.ABS_SUM:
+                return anneal_abs_sum_perms
+            case _:
+                raise KeyError(undefined_msg)
+
+    @property
+    def sweep_func(self: "Objective") -> Callable:
+        """Get the function for the change in the objective for a sweep.
+
+        Returns
+        -------
+        The sweep objective function.
+
+        Raises
+        ------
+        KeyError: If the objective is not recognised.
+        """
+        undefined_msg = f"Objective not recognised. Choose from {self._names}"
+        match self:
+            case self.SUM:
+                return sweep_sum_perms
+            case self.ABS_SUM:
+                return sweep_abs_sum_perms
+            case _:
+                raise KeyError(undefined_msg)
+
     def _names(self: "Objective") -> list[str]:
         """Return a list of names of all the Objective enum members."""
         return list(Objective.__members__.keys())
 
 
-@numba.njit
+@numba.njit(**_JIT_OPTIONS)
+def _mode_sum(
+    big_corr: np.ndarray,
+    p: np.ndarray,
+    n_channels: int,
+    symmetric: bool,
+) -> float:
+    """Calculate the element-wise sum of one permuted matrix."""
+    if not symmetric:
+        s = 0.0
+        for r in range(n_channels):
+            row = big_corr[p[r]]
+            for c in range(n_channels):
+                s += row[p[c]]
+        return s
+
+    s_diag = 0.0
+    s_off = 0.0
+    for r in range(n_channels):
+        row = big_corr[p[r]]
+        s_diag += row[p[r]]
+        for c in range(r + 1, n_channels):
+            s_off += row[p[c]]
+    return s_diag + 2 * s_off
+
+
+@numba.njit(_SUM_SIG, parallel=True, **_JIT_OPTIONS)
 def sum_perms(
     big_corr: np.ndarray,
     perm: np.ndarray,
     n_modes: int,
     n_channels: int,
+    symmetric: bool,
 ) -> float:
     """Calculate sum of element-wise sums of permuted matrices.
 
+    Modes are summed in parallel; the number of threads is controlled by
+    ``NUMBA_NUM_THREADS``.
+
     Parameters
     ----------
     big_corr : np.ndarray
@@ -59,29 +196,35 @@ def sum_perms(
         The number of modes.
     n_channels : int
         The number of channels.
+    symmetric : bool
+        Whether the correlation matrix is symmetric, in which case only
+        the upper triangle of each permuted matrix is read.
 
     Returns
     -------
     The sum of the permuted matrices.
 
     """
-    ret = 0
-    for i in range(n_modes):
-        first_pass = big_corr[perm[:, i]]
-        second_pass = first_pass[:, perm[:, i]]
-        ret += second_pass.sum()
+    ret = 0.0
+    for i in numba.prange(n_modes):
+        s = _mode_sum(big_corr, perm[:, i], n_channels, symmetric)
+        ret += s
     return ret - n_modes * n_channels
 
 
-@numba.njit
+@numba.njit(_SUM_SIG, parallel=True, **_JIT_OPTIONS)
 def abs_sum_perms(
     big_corr: np.ndarray,
     perm: np.ndarray,
     n_modes: int,
     n_channels: int,
+    symmetric: bool,
 ) -> float:
     """Calculate sum of magnitudes of element-wise sums of permuted matrices.
 
+    Modes are summed in parallel; the number of threads is controlled by
+    ``NUMBA_NUM_THREADS``.
+
     Parameters
     ----------
     big_corr : np.ndarray
@@ -92,15 +235,654 @@ def abs_sum_perms(
         The number of modes.
     n_channels : int
         The number of channels.
+    symmetric : bool
+        Whether the correlation matrix is symmetric, in which case only
+        the upper triangle of each permuted matrix is read.
 
     Returns
     -------
     The sum of the permuted matrices.
 
     """
-    ret = 0
-    for i in range(n_modes):
-        first_pass = big_corr[perm[:, i]]
-        second_pass = first_pass[:, perm[:, i]]
-        ret += abs(second_pass.sum())
+    ret = 0.0
+    for i in numba.prange(n_modes):
+        s = _mode_sum(big_corr, perm[:, i], n_channels, symmetric)
+        ret += abs(s)
     return ret - n_modes * n_channels
+
+
+@numba.njit(_MODE_SUMS_SIG, **_JIT_OPTIONS)
+def mode_sums(
+    big_corr: np.ndarray,
+    perm: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+    symmetric: bool,
+) -> np.ndarray:
+    """Calculate the element-wise sum of each permuted matrix.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    perm : np.ndarray
+        The permutation matrix.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+    symmetric : bool
+        Whether the correlation matrix is symmetric, in which case only
+        the upper triangle of each permuted matrix is read.
+
+    Returns
+    -------
+    The sum of each permuted matrix.
+
+    """
+    sums = np.empty(n_modes)
+    for i in range(n_modes):
+        s = _mode_sum(big_corr, perm[:, i], n_channels, symmetric)
+        sums[i] = s
+    return sums
+
+
+@numba.njit(_GENERATE_SIG, **_JIT_OPTIONS)
+def generate_perms(
+    big_corr: np.ndarray,
+    perm: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> np.ndarray:
+    """Gather each permuted matrix.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    perm : np.ndarray
+        The permutation matrix.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+
+    Returns
+    -------
+    The permuted matrices, each transposed.
+
+    """
+    out = np.empty((n_modes, n_channels, n_channels), dtype=big_corr.dtype)
+    for i in range(n_modes):
+        p = perm[:, i]
+        for r in range(n_channels):
+            row = big_corr[p[r]]
+            for c in range(n_channels):
+                out[i, c, r] = row[p[c]]
+    return out
+
+
+@numba.njit(_DELTA_MODE_SUMS_SIG, **_JIT_OPTIONS)
+def _delta_mode_sums(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    perm: np.ndarray,
+    channel: int,
+    channel_perm: np.ndarray,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Update the sum of each permuted matrix after one channel is permuted.
+
+    Only the row and column belonging to ``channel`` change, so their old
+    contribution is removed and their new contribution added. Columns are
+    read as rows of ``big_corr_t`` so both gathers stay within one row.
+    """
+    for i in range(n_modes):
+        old_k = perm[channel, i]
+        new_k = channel_perm[i]
+        old_row = big_corr[old_k]
+        new_row = big_corr[new_k]
+        old_col = big_corr_t[old_k]
+        new_col = big_corr_t[new_k]
+        s = 0.0
+        for c in range(n_channels):
+            k = perm[c, i]
+            s += new_row[k] + new_col[k] - old_row[k] - old_col[k]
+        # The loop paired the new row and column with the old diagonal entry.
+        s += new_row[new_k] - new_row[old_k] - new_col[old_k] + old_row[old_k]
+        new_sums[i] = sums[i] + s
+
+
+@numba.njit("float64(float64[::1], float64[::1])", **_JIT_OPTIONS)
+def _sum_delta(sums: np.ndarray, new_sums: np.ndarray) -> float:
+    """Calculate the change in `sum_perms` from the per-mode sums."""
+    ret = 0.0
+    for i in range(sums.shape[0]):
+        ret += new_sums[i] - sums[i]
+    return ret
+
+
+@numba.njit("float64(float64[::1], float64[::1])", **_JIT_OPTIONS)
+def _abs_sum_delta(sums: np.ndarray, new_sums: np.ndarray) -> float:
+    """Calculate the change in `abs_sum_perms` from the per-mode sums."""
+    ret = 0.0
+    for i in range(sums.shape[0]):
+        ret += abs(new_sums[i]) - abs(sums[i])
+    return ret
+
+
+@numba.njit("void(int32[::1], int32[::1])", **_JIT_OPTIONS)
+def shuffle_channel(modes: np.ndarray, flat: np.ndarray) -> None:
+    """Fisher-Yates shuffle one channel's modes and flat indices together."""
+    for k in range(modes.shape[0] - 1, 0, -1):
+        j = np.random.randint(0, k + 1)
+        modes[k], modes[j] = modes[j], modes[k]
+        flat[k], flat[j] = flat[j], flat[k]
+
+
+@numba.njit("int64(int32[:, ::1], int32[:, ::1])", **_JIT_OPTIONS)
+def permute_random_channel(permuted_modes: np.ndarray, flat_perm: np.ndarray) -> int:
+    """Shuffle the modes of a random channel in place.
+
+    The channel and the shuffle both use numba's random stream.
+    """
+    channel = np.random.randint(0, permuted_modes.shape[0])
+    shuffle_channel(permuted_modes[channel], flat_perm[channel])
+    return channel
+
+
+@numba.njit("boolean(float64, float64)", **_JIT_OPTIONS)
+def accept_step(delta: float, temperature: float) -> bool:
+    """Decide whether to accept a step which changes the value by delta.
+
+    Improving steps are always accepted. With a positive temperature, other
+    steps are accepted with probability ``exp(delta / temperature)``, drawn
+    from numba's random stream.
+
+    Parameters
+    ----------
+    delta : float
+        The change in the value.
+    temperature : float
+        The temperature.
+
+    Returns
+    -------
+    Whether to accept the step.
+
+    """
+    if delta > 0:
+        return True
+    if temperature > 0:
+        return np.random.random() < np.exp(delta / temperature)
+    return False
+
+
+@numba.njit(_DELTA_SIG, **_JIT_OPTIONS)
+def delta_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    old_perm: np.ndarray,
+    new_perm: np.ndarray,
+    channel: int,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> float:
+    """Calculate the change in `sum_perms` after one channel is permuted.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    old_perm : np.ndarray
+        The permutation matrix before the step.
+    new_perm : np.ndarray
+        The permutation matrix after the step.
+    channel : int
+        The channel which was permuted.
+    sums : np.ndarray
+        The sum of each permuted matrix before the step.
+    new_sums : np.ndarray
+        Output array for the sum of each permuted matrix after the step.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+
+    Returns
+    -------
+    The change in the objective.
+
+    """
+    _delta_mode_sums(
+        big_corr,
+        big_corr_t,
+        old_perm,
+        channel,
+        new_perm[channel],
+        sums,
+        new_sums,
+        n_modes,
+        n_channels,
+    )
+    return _sum_delta(sums, new_sums)
+
+
+@numba.njit(_DELTA_SIG, **_JIT_OPTIONS)
+def delta_abs_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    old_perm: np.ndarray,
+    new_perm: np.ndarray,
+    channel: int,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> float:
+    """Calculate the change in `abs_sum_perms` after one channel is permuted.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    old_perm : np.ndarray
+        The permutation matrix before the step.
+    new_perm : np.ndarray
+        The permutation matrix after the step.
+    channel : int
+        The channel which was permuted.
+    sums : np.ndarray
+        The sum of each permuted matrix before the step.
+    new_sums : np.ndarray
+        Output array for the sum of each permuted matrix after the step.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+
+    Returns
+    -------
+    The change in the objective.
+
+    """
+    _delta_mode_sums(
+        big_corr,
+        big_corr_t,
+        old_perm,
+        channel,
+        new_perm[channel],
+        sums,
+        new_sums,
+        n_modes,
+        n_channels,
+    )
+    return _abs_sum_delta(sums, new_sums)
+
+
+@numba.njit(inline="always", **_JIT_OPTIONS)
+def _anneal(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    permuted_modes: np.ndarray,
+    flat_perm: np.ndarray,
+    sums: np.ndarray,
+    value: float,
+    best_modes: np.ndarray,
+    best_flat: np.ndarray,
+    best_value: float,
+    temperature: float,
+    n_steps: int,
+    iterations: np.ndarray,
+    values: np.ndarray,
+    perms: np.ndarray,
+    record_history: bool,
+    absolute: bool,
+) -> tuple[float, float, int]:
+    """Take single-channel annealing steps without returning to Python.
+
+    Scores steps with `_abs_sum_delta` if ``absolute``, else `_sum_delta`.
+    """
+    n_channels, n_modes = permuted_modes.shape
+    new_sums = np.empty_like(sums)
+    modes = np.empty(n_modes, dtype=np.int32)
+    flat = np.empty(n_modes, dtype=np.int32)
+    n_accepted = 0
+    for iteration in range(n_steps):
+        channel = np.random.randint(0, n_channels)
+        modes[:] = permuted_modes[channel]
+        flat[:] = flat_perm[channel]
+        shuffle_channel(modes, flat)
+        _delta_mode_sums(
+            big_corr,
+            big_corr_t,
+            flat_perm,
+            channel,
+            flat,
+            sums,
+            new_sums,
+            n_modes,
+            n_channels,
+        )
+        if absolute:
+            delta = _abs_sum_delta(sums, new_sums)
+        else:
+            delta = _sum_delta(sums, new_sums)
+        if accept_step(delta, temperature):
+            permuted_modes[channel] = modes
+            flat_perm[channel] = flat
+            sums[:] = new_sums
+            value += delta
+            if value > best_value:
+                best_value = value
+                best_modes[:] = permuted_modes
+                best_flat[:] = flat_perm
+            iterations[n_accepted] = iteration
+            values[n_accepted] = value
+            if record_history:
+                perms[n_accepted] = permuted_modes
+            n_accepted += 1
+    return value, best_value, n_accepted
+
+
+@numba.njit(_ANNEAL_SIG, **_JIT_OPTIONS)
+def anneal_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    permuted_modes: np.ndarray,
+    flat_perm: np.ndarray,
+    sums: np.ndarray,
+    value: float,
+    best_modes: np.ndarray,
+    best_flat: np.ndarray,
+    best_value: float,
+    temperature: float,
+    n_steps: int,
+    iterations: np.ndarray,
+    values: np.ndarray,
+    perms: np.ndarray,
+    record_history: bool,
+) -> tuple[float, float, int]:
+    """Take a batch of single-channel steps scored with `sum_perms`.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    permuted_modes : np.ndarray
+        The current permutation of the modes, updated in place.
+    flat_perm : np.ndarray
+        The current permutation matrix, updated in place.
+    sums : np.ndarray
+        The sum of each permuted matrix, updated in place.
+    value : float
+        The current value of the objective.
+    best_modes : np.ndarray
+        The best permutation of the modes, updated in place.
+    best_flat : np.ndarray
+        The best permutation matrix, updated in place.
+    best_value : float
+        The best value of the objective.
+    temperature : float
+        The temperature passed to `accept_step`.
+    n_steps : int
+        The number of steps to take.
+    iterations : np.ndarray
+        Output array for the index within the batch of each accepted step.
+    values : np.ndarray
+        Output array for the value after each accepted step.
+    perms : np.ndarray
+        Output array for the permutation after each accepted step.
+    record_history : bool
+        Whether to fill ``perms``. If not, it may be empty.
+
+    Returns
+    -------
+    The value after the batch, the best value and the number of accepted
+    steps.
+
+    """
+    return _anneal(
+        big_corr,
+        big_corr_t,
+        permuted_modes,
+        flat_perm,
+        sums,
+        value,
+        best_modes,
+        best_flat,
+        best_value,
+        temperature,
+        n_steps,
+        iterations,
+        values,
+        perms,
+        record_history,
+        False,
+    )
+
+
+@numba.njit(_ANNEAL_SIG, **_JIT_OPTIONS)
+def anneal_abs_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    permuted_modes: np.ndarray,
+    flat_perm: np.ndarray,
+    sums: np.ndarray,
+    value: float,
+    best_modes: np.ndarray,
+    best_flat: np.ndarray,
+    best_value: float,
+    temperature: float,
+    n_steps: int,
+    iterations: np.ndarray,
+    values: np.ndarray,
+    perms: np.ndarray,
+    record_history: bool,
+) -> tuple[float, float, int]:
+    """Take a batch of single-channel steps scored with `abs_sum_perms`.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    permuted_modes : np.ndarray
+        The current permutation of the modes, updated in place.
+    flat_perm : np.ndarray
+        The current permutation matrix, updated in place.
+    sums : np.ndarray
+        The sum of each permuted matrix, updated in place.
+    value : float
+        The current value of the objective.
+    best_modes : np.ndarray
+        The best permutation of the modes, updated in place.
+    best_flat : np.ndarray
+        The best permutation matrix, updated in place.
+    best_value : float
+        The best value of the objective.
+    temperature : float
+        The temperature passed to `accept_step`.
+    n_steps : int
+        The number of steps to take.
+    iterations : np.ndarray
+        Output array for the index within the batch of each accepted step.
+    values : np.ndarray
+        Output array for the value after each accepted step.
+    perms : np.ndarray
+        Output array for the permutation after each accepted step.
+    record_history : bool
+        Whether to fill ``perms``. If not, it may be empty.
+
+    Returns
+    -------
+    The value after the batch, the best value and the number of accepted
+    steps.
+
+    """
+    return _anneal(
+        big_corr,
+        big_corr_t,
+        permuted_modes,
+        flat_perm,
+        sums,
+        value,
+        best_modes,
+        best_flat,
+        best_value,
+        temperature,
+        n_steps,
+        iterations,
+        values,
+        perms,
+        record_history,
+        True,
+    )
+
+
+@numba.njit(_SWEEP_MODE_SUMS_SIG, parallel=True, **_JIT_OPTIONS)
+def _sweep_mode_sums(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    perm: np.ndarray,
+    proposals: np.ndarray,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Update the sum of each permuted matrix for a proposal on every channel.
+
+    Channels are handled in parallel; the number of threads is controlled by
+    ``NUMBA_NUM_THREADS``.
+    """
+    for channel in numba.prange(n_channels):
+        _delta_mode_sums(
+            big_corr,
+            big_corr_t,
+            perm,
+            channel,
+            proposals[channel],
+            sums,
+            new_sums[channel],
+            n_modes,
+            n_channels,
+        )
+
+
+@numba.njit(_SWEEP_SIG, **_JIT_OPTIONS)
+def sweep_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    perm: np.ndarray,
+    proposals: np.ndarray,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> np.ndarray:
+    """Calculate the change in `sum_perms` for a proposal on every channel.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    perm : np.ndarray
+        The current permutation matrix.
+    proposals : np.ndarray
+        The proposed permutation for each channel, one row per channel.
+    sums : np.ndarray
+        The sum of each permuted matrix for ``perm``.
+    new_sums : np.ndarray
+        Output array for the sum of each permuted matrix, one row per channel.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+
+    Returns
+    -------
+    The change in the objective for each channel's proposal.
+
+    """
+    _sweep_mode_sums(
+        big_corr,
+        big_corr_t,
+        perm,
+        proposals,
+        sums,
+        new_sums,
+        n_modes,
+        n_channels,
+    )
+    ret = np.empty(n_channels)
+    for channel in range(n_channels):
+        ret[channel] = _sum_delta(sums, new_sums[channel])
+    return ret
+
+
+@numba.njit(_SWEEP_SIG, **_JIT_OPTIONS)
+def sweep_abs_sum_perms(
+    big_corr: np.ndarray,
+    big_corr_t: np.ndarray,
+    perm: np.ndarray,
+    proposals: np.ndarray,
+    sums: np.ndarray,
+    new_sums: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> np.ndarray:
+    """Calculate the change in `abs_sum_perms` for a proposal on every channel.
+
+    Parameters
+    ----------
+    big_corr : np.ndarray
+        The correlation matrix.
+    big_corr_t : np.ndarray
+        The transpose of the correlation matrix, stored C-contiguously.
+    perm : np.ndarray
+        The current permutation matrix.
+    proposals : np.ndarray
+        The proposed permutation for each channel, one row per channel.
+    sums : np.ndarray
+        The sum of each permuted matrix for ``perm``.
+    new_sums : np.ndarray
+        Output array for the sum of each permuted matrix, one row per channel.
+    n_modes : int
+        The number of modes.
+    n_channels : int
+        The number of channels.
+
+    Returns
+    -------
+    The change in the objective for each channel's proposal.
+
+    """
+    _sweep_mode_sums(
+        big_corr,
+        big_corr_t,
+        perm,
+        proposals,
+        sums,
+        new_sums,
+        n_modes,
+        n_channels,
+    )
+    ret = np.empty(n_channels)
+    for channel in range(n_channels):
+        ret[channel] = _abs_sum_delta(sums, new_sums[channel])
+    return ret
@@ -1,7 +1,12 @@
 """Meta-modes annealing problem."""
 import numpy as np
 
-from annealing.metamodes.objectives import Objective
+from annealing.metamodes.objectives import (
+    CORRELATION_DTYPES,
+    Objective,
+    generate_perms,
+    mode_sums,
+)
 from annealing.metamodes.solution import MetaModeSolution
 
 rng = np.random.default_rng()
@@ -22,6 +27,8 @@ class MetaModeProblem:
         n_modes: int,
         n_channels: int,
         objective: str | Objective,
+        dtype: np.dtype | type = np.float64,
+        symmetric: bool | None = None,
     ) -> None:
         """Initialize a MetaModeProblem object.
 
@@ -35,16 +42,50 @@ class MetaModeProblem:
             The number of channels.
         objective : str or Objective
             The objective function to evaluate.
+        dtype : np.dtype or type
+            The dtype used to store the correlation matrix, by default
+            float64. float32 halves the memory read by each evaluation at
+            the cost of precision.
+        symmetric : bool, optional
+            Whether the correlation matrix is symmetric, which halves the
+            work of a full evaluation. By default, this is checked exactly,
+            so pass True for a matrix that is symmetric up to rounding.
+
+        Raises
+        ------
+        ValueError: If the dtype is not supported.
         """
-        self.correlation_matrix = correlation_matrix
+        if np.dtype(dtype).name not in CORRELATION_DTYPES:
+            msg = f"dtype must be one of {CORRELATION_DTYPES}, got {dtype}"
+            raise ValueError(msg)
+        self.correlation_matrix = np.ascontiguousarray(
+            correlation_matrix,
+            dtype=dtype,
+        )
+        if symmetric is None:
+            symmetric = np.array_equal(
+                self.correlation_matrix,
+                self.correlation_matrix.T,
+            )
+        self.symmetric = bool(symmetric)
+        if self.symmetric:
+            self._correlation_matrix_t = self.correlation_matrix
+        else:
+            self._correlation_matrix_t = np.ascontiguousarray(
+                self.correlation_matrix.T,
+            )
         self.n_modes = n_modes
         self.n_channels = n_channels
         self.n_metamodes = self.n_modes
         if isinstance(objective, str):
             objective = Objective[objective]
         self.objective = objective
+        self._func = objective.func
+        self._delta_func = objective.delta_func
+        self._anneal_func = objective.anneal_func
+        self._sweep_func = objective.sweep_func
 
-        self.reindexer = np.arange(self.n_channels) * self.n_modes
+        self.reindexer = np.arange(self.n_channels, dtype=np.int32) * self.n_modes
 
     def evaluate(
         self: "MetaModeProblem",
@@ -57,10 +98,191 @@ class MetaModeProblem:
         solution : np.ndarray
             A solution.
         """
-        func = self.objective.func
-        return func(
+        return self._func(
+            self.correlation_matrix,
+            solution.flat_perm,
+            self.n_modes,
+            self.n_channels,
+            self.symmetric,
+        )
+
+    def mode_sums(
+        self: "MetaModeProblem",
+        solution: MetaModeSolution,
+    ) -> np.ndarray:
+        """Sum each of the permuted correlation matrices.
+
+        Parameters
+        ----------
+        solution : MetaModeSolution
+            A solution.
+
+        Returns
+        -------
+        np.ndarray
+            The element-wise sum of the correlation matrix for each mode.
+        """
+        return mode_sums(
+            self.correlation_matrix,
+            solution.flat_perm,
+            self.n_modes,
+            self.n_channels,
+            self.symmetric,
+        )
+
+    def delta_evaluate(
+        self: "MetaModeProblem",
+        old_solution: MetaModeSolution,
+        new_solution: MetaModeSolution,
+        channel: int,
+        sums: np.ndarray,
+        new_sums: np.ndarray,
+    ) -> float:
+        """Calculate the change in the objective after permuting one channel.
+
+        Parameters
+        ----------
+        old_solution : MetaModeSolution
+            The solution before the step.
+        new_solution : MetaModeSolution
+            The solution after the step. It may only differ from
+            ``old_solution`` in ``channel``.
+        channel : int
+            The channel which was permuted.
+        sums : np.ndarray
+            The output of `mode_sums` for ``old_solution``.
+        new_sums : np.ndarray
+            Filled with the output of `mode_sums` for ``new_solution``.
+
+        Returns
+        -------
+        float
+            The change in the objective.
+        """
+        return self._delta_func(
+            self.correlation_matrix,
+            self._correlation_matrix_t,
+            old_solution.flat_perm,
+            new_solution.flat_perm,
+            channel,
+            sums,
+            new_sums,
+            self.n_modes,
+            self.n_channels,
+        )
+
+    def anneal(
+        self: "MetaModeProblem",
+        solution: MetaModeSolution,
+        sums: np.ndarray,
+        value: float,
+        best_solution: MetaModeSolution,
+        best_value: float,
+        temperature: float,
+        n_steps: int,
+        iterations: np.ndarray,
+        values: np.ndarray,
+        perms: np.ndarray,
+        *,
+        record_history: bool = True,
+    ) -> tuple[float, float, int]:
+        """Take a batch of single-channel annealing steps in compiled code.
+
+        Each step permutes one random channel and is accepted according to
+        `accept_step`.
+
+        Parameters
+        ----------
+        solution : MetaModeSolution
+            The current solution, updated in place.
+        sums : np.ndarray
+            The output of `mode_sums` for ``solution``, updated in place.
+        value : float
+            The value of ``solution``.
+        best_solution : MetaModeSolution
+            The best solution found so far, updated in place.
+        best_value : float
+            The value of ``best_solution``.
+        temperature : float
+            The temperature used to accept worse steps.
+        n_steps : int
+            The number of steps to take.
+        iterations : np.ndarray
+            Filled with the index within the batch of each accepted step.
+        values : np.ndarray
+            Filled with the value after each accepted step.
+        perms : np.ndarray
+            Filled with the permutation after each accepted step.
+        record_history : bool
+            Whether to fill ``perms``. If not, it may be empty.
+
+        Returns
+        -------
+        float
+            The value of the solution after the batch.
+        float
+            The value of the best solution after the batch.
+        int
+            The number of accepted steps.
+        """
+        return self._anneal_func(
+            self.correlation_matrix,
+            self._correlation_matrix_t,
+            solution.permuted_modes,
+            solution.flat_perm,
+            sums,
+            value,
+            best_solution.permuted_modes,
+            best_solution.flat_perm,
+            best_value,
+            temperature,
+            n_steps,
+            iterations,
+            values,
+            perms,
+            record_history,
+        )
+
+    def sweep_evaluate(
+        self: "MetaModeProblem",
+        solution: MetaModeSolution,
+        proposals: np.ndarray,
+        flat_proposals: np.ndarray,
+        sums: np.ndarray,
+        new_sums: np.ndarray,
+    ) -> np.ndarray:
+        """Calculate the change in the objective for a proposal on every channel.
+
+        Parameters
+        ----------
+        solution : MetaModeSolution
+            The current solution.
+        proposals : np.ndarray
+            A permutation of the modes for each channel, with the same
+            shape as ``solution.permuted_modes``.
+        flat_proposals : np.ndarray
+            Buffer of the same shape as ``proposals``, filled with the
+            proposals as indices into the correlation matrix.
+        sums : np.ndarray
+            The output of `mode_sums` for ``solution``.
+        new_sums : np.ndarray
+            Filled with the output of `mode_sums` for each proposal,
+            one row per channel.
+
+        Returns
+        -------
+        np.ndarray
+            The change in the objective if each channel alone took
+            its proposal.
+        """
+        np.add(proposals, self.reindexer[:, None], out=flat_proposals)
+        return self._sweep_func(
             self.correlation_matrix,
-            solution.permuted_modes + self.reindexer[:, None],
+            self._correlation_matrix_t,
+            solution.flat_perm,
+            flat_proposals,
+            sums,
+            new_sums,
             self.n_modes,
             self.n_channels,
         )
@@ -78,7 +300,9 @@ class MetaModeProblem:
         np.ndarray
             A set of correlation matrices.
         """
-        perm = solution.permuted_modes
-        perm = perm + self.reindexer[:, None]
-        perm = self.correlation_matrix[perm][:, :, perm]
-        return np.diagonal(perm, axis1=1, axis2=3).T
+        return generate_perms(
+            self.correlation_matrix,
+            solution.flat_perm,
+            self.n_modes,
+            self.n_channels,
+        )
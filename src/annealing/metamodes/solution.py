@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from annealing.metamodes.objectives import permute_random_channel
+
 rng = np.random.default_rng()
 
 
@@ -20,6 +22,9 @@ class MetaModeSolution:
         The unpermuted modes.
     permuted_modes : np.ndarray
         The permuted modes.
+    flat_perm : np.ndarray
+        The permuted modes as indices into the correlation matrix, i.e.
+        ``permuted_modes`` offset by ``n_modes`` for each channel.
     """
 
     def __init__(
@@ -45,13 +50,20 @@ class MetaModeSolution:
 
         if permutation is None:
             self.unpermuted_modes = np.tile(
-                A=np.arange(self.n_modes),
+                A=np.arange(self.n_modes, dtype=np.int32),
                 reps=(self.n_channels, 1),
             )
         else:
             self.unpermuted_modes = permutation
 
-        self.permuted_modes = None
+        self.permuted_modes = np.array(
+            self.unpermuted_modes,
+            dtype=np.int32,
+            order="C",
+        )
+        offsets = np.arange(self.n_channels, dtype=np.int32) * self.n_modes
+        self._offsets = offsets[:, None]
+        self.flat_perm = self.permuted_modes + self._offsets
 
     def random_permutation(self: "MetaModeSolution") -> "MetaModeSolution":
         """Randomly permute the modes for each channel.
@@ -61,18 +73,16 @@ class MetaModeSolution:
         MetaModeSolution
             A solution with randomly permuted modes.
         """
-        self.permuted_modes = np.apply_along_axis(
-            func1d=rng.permutation,
-            axis=1,
-            arr=self.unpermuted_modes,
-        )
+        np.copyto(self.permuted_modes, self.unpermuted_modes, casting="same_kind")
+        rng.permuted(self.permuted_modes, axis=1, out=self.permuted_modes)
+        np.add(self.permuted_modes, self._offsets, out=self.flat_perm)
         return self
 
     def permute_one_channel(
         self: "MetaModeSolution",
         channel: int,
     ) -> "MetaModeSolution":
-        """Permute the modes for one channel.
+        """Permute the modes for one channel in place.
 
         Parameters
         ----------
@@ -84,10 +94,51 @@ class MetaModeSolution:
         MetaModeSolution
             The solution with one channel permuted.
         """
-        self.permuted_modes = self.unpermuted_modes.copy()
-        self.permuted_modes[channel] = rng.permutation(self.n_modes)
+        rng.shuffle(self.permuted_modes[channel])
+        np.add(
+            self.permuted_modes[channel],
+            self._offsets[channel],
+            out=self.flat_perm[channel],
+        )
         return self
 
+    def set_channel(
+        self: "MetaModeSolution",
+        channel: int,
+        modes: np.ndarray,
+    ) -> "MetaModeSolution":
+        """Set the permutation of the modes for one channel.
+
+        Parameters
+        ----------
+        channel : int
+            The channel to set.
+        modes : np.ndarray
+            The new permutation of the modes.
+
+        Returns
+        -------
+        MetaModeSolution
+            The solution with one channel set.
+        """
+        self.permuted_modes[channel] = modes
+        np.add(
+            self.permuted_modes[channel],
+            self._offsets[channel],
+            out=self.flat_perm[channel],
+        )
+        return self
+
+    def permute_random_channel(self: "MetaModeSolution") -> int:
+        """Permute the modes for one random channel in place.
+
+        Returns
+        -------
+        int
+            The channel which was permuted.
+        """
+        return permute_random_channel(self.permuted_modes, self.flat_perm)
+
     def step(self: "MetaModeSolution") -> "MetaModeSolution":
         """Take a step in the annealing process.
 
@@ -96,9 +147,7 @@ class MetaModeSolution:
         MetaModeSolution
             The solution after taking a step.
         """
-        self.permute_one_channel(
-            channel=rng.integers(self.n_channels),
-        )
+        self.permute_random_channel()
         return self
 
     def copy(self: "MetaModeSolution") -> "MetaModeSolution":
@@ -1,8 +1,9 @@
 """A solver for the meta-modes annealing algorithm."""
 
 import numpy as np
-from tqdm.auto import trange
+from tqdm.auto import tqdm
 
+from annealing.metamodes.objectives import accept_step
 from annealing.metamodes.problem import MetaModeProblem
 from annealing.metamodes.solution import MetaModeSolution
 
@@ -16,54 +17,135 @@ class MetaModeSolver:
     ----------
     problem : MetaModeProblem
         The problem to solve.
+    current_solution : MetaModeSolution
+        The current state of the annealing process. With a non-zero
+        temperature this may be worse than `best_solution`.
+    current_value : float
+        The value of `current_solution`.
     best_solution : MetaModeSolution
         The best solution found so far.
     best_value : float
-        The value of the best solution found so far.
-    record : list[tuple[int, float]]
-        A record of the best value at each iteration
-        for which a new best value was found.
-    steps : list[np.ndarray]
-        A record of the solutions at each iteration
-        for which a new best value was found.
+        The value of `best_solution`.
+    temperature : float
+        The temperature used to accept worse steps.
+    sweep : bool
+        Whether each step proposes a permutation for every channel
+        and takes the best, rather than permuting one random channel.
+    record_iters : np.ndarray
+        The iteration of each accepted step. With a non-zero temperature
+        this includes steps which made the value worse.
+    record_values : np.ndarray
+        The value after each accepted step.
+    steps : np.ndarray
+        The permutation after each accepted step. Use `materialize_step`
+        to get the corresponding correlation matrices. Empty unless
+        `record_history` is set.
+    record_history : bool
+        Whether to store the permutation after each accepted step in `steps`.
     """
 
     def __init__(
         self: "MetaModeSolver",
-        correlation_matrix: np.ndarray,
-        n_modes: int,
-        n_channels: int,
-        objective: str,
+        correlation_matrix: np.ndarray | None = None,
+        n_modes: int | None = None,
+        n_channels: int | None = None,
+        objective: str | None = None,
+        *,
+        problem: MetaModeProblem | None = None,
+        dtype: np.dtype | type = np.float64,
+        symmetric: bool | None = None,
+        temperature: float = 0.0,
+        sweep: bool = False,
+        record_history: bool = True,
     ) -> None:
         """Initialize a MetaModeSolver object.
 
+        Either pass the correlation matrix, the number of modes and channels
+        and the objective, or an existing ``problem``.
+
         Parameters
         ----------
-        correlation_matrix : np.ndarray
+        correlation_matrix : np.ndarray, optional
             The correlation matrix.
-        n_modes : int
+        n_modes : int, optional
             The number of modes.
-        n_channels : int
+        n_channels : int, optional
             The number of channels.
-        objective : str
+        objective : str, optional
             The objective function to evaluate.
+        problem : MetaModeProblem, optional
+            An existing problem to solve. Solvers can share a problem,
+            including its copy of the correlation matrix.
+        dtype : np.dtype or type
+            The dtype used to store the correlation matrix, by default float64.
+        symmetric : bool, optional
+            Whether the correlation matrix is symmetric. By default, this is
+            checked.
+        temperature : float
+            The temperature used to accept worse steps. A step which changes
+            the value by ``delta < 0`` is accepted with probability
+            ``exp(delta / temperature)``. By default, only improving steps
+            are accepted.
+        sweep : bool
+            Whether each step proposes a permutation for every channel
+            and takes the best, rather than permuting one random channel.
+        record_history : bool
+            Whether to store the permutation after each accepted step in
+            `steps`. This grows without limit when worse steps are accepted.
+
+        Raises
+        ------
+        ValueError
+            If both or neither of a problem and its definition are given.
         """
-        self.problem = MetaModeProblem(
-            correlation_matrix=correlation_matrix,
-            n_modes=n_modes,
-            n_channels=n_channels,
-            objective=objective,
-        )
+        definition = (correlation_matrix, n_modes, n_channels, objective)
+        if problem is None:
+            if any(arg is None for arg in definition):
+                msg = (
+                    "Pass correlation_matrix, n_modes, n_channels and objective,"
+                    " or an existing problem."
+                )
+                raise ValueError(msg)
+            problem = MetaModeProblem(
+                correlation_matrix=correlation_matrix,
+                n_modes=n_modes,
+                n_channels=n_channels,
+                objective=objective,
+                dtype=dtype,
+                symmetric=symmetric,
+            )
+        elif any(arg is not None for arg in definition):
+            msg = "Pass either an existing problem or its definition, not both."
+            raise ValueError(msg)
+        self.problem = problem
+        n_modes = self.problem.n_modes
+        n_channels = self.problem.n_channels
         solution = MetaModeSolution(
             n_modes=n_modes,
             n_channels=n_channels,
         )
-        self.best_solution = solution.random_permutation()
-        self.best_value = self.problem.evaluate(self.best_solution)
+        self.current_solution = solution.random_permutation()
+        self.current_value = self.problem.evaluate(self.current_solution)
+        self.best_solution = self.current_solution.copy()
+        self.best_value = self.current_value
+        self._mode_sums = self.problem.mode_sums(self.current_solution)
+        self._new_mode_sums = np.empty_like(self._mode_sums)
+        self._scratch = self.current_solution.copy()
+        self.temperature = temperature
+        self.sweep = sweep
+        self.record_history = record_history
+        self._proposals = np.empty_like(self.current_solution.permuted_modes)
+        self._flat_proposals = np.empty_like(self._proposals)
+        self._sweep_sums = np.empty((n_channels, n_modes))
         self._iteration = 0
 
-        self.record = []
-        self.steps = []
+        self._record_iters = [np.empty(0, dtype=np.int64)]
+        self._record_values = [np.empty(0)]
+        self._steps = [np.empty((0, n_channels, n_modes), dtype=np.int32)]
+
+        self._batch_iterations = np.empty(0, dtype=np.int64)
+        self._batch_values = np.empty(0)
+        self._batch_perms = np.empty((0, n_channels, n_modes), dtype=np.int32)
 
         self._tqdm = None
 
@@ -75,18 +157,79 @@ class MetaModeSolver:
         bool
             Whether the step was accepted.
         """
-        solution = self.best_solution.copy()
-        solution.step()
-        value = self.problem.evaluate(solution)
-        if value > self.best_value:
-            self.best_solution = solution
-            self.best_value = value
-            if self._tqdm is not None:
-                self._tqdm.set_postfix(best_value=self.best_value)
+        if self.sweep:
+            return self._sweep_step()
+
+        solution = self._scratch
+        np.copyto(solution.permuted_modes, self.current_solution.permuted_modes)
+        np.copyto(solution.flat_perm, self.current_solution.flat_perm)
+        channel = solution.permute_random_channel()
+        delta = self.problem.delta_evaluate(
+            old_solution=self.current_solution,
+            new_solution=solution,
+            channel=channel,
+            sums=self._mode_sums,
+            new_sums=self._new_mode_sums,
+        )
+        if accept_step(delta, self.temperature):
+            self._scratch, self.current_solution = self.current_solution, solution
+            self.current_value += delta
+            self._mode_sums, self._new_mode_sums = (
+                self._new_mode_sums,
+                self._mode_sums,
+            )
+            self._update_best()
+            return True
+        return False
+
+    def _sweep_step(self: "MetaModeSolver") -> bool:
+        """Propose a permutation for every channel and take the best.
+
+        Returns
+        -------
+        bool
+            Whether the step was accepted.
+        """
+        rng.permuted(
+            self.current_solution.permuted_modes,
+            axis=1,
+            out=self._proposals,
+        )
+        deltas = self.problem.sweep_evaluate(
+            solution=self.current_solution,
+            proposals=self._proposals,
+            flat_proposals=self._flat_proposals,
+            sums=self._mode_sums,
+            new_sums=self._sweep_sums,
+        )
+        channel = np.argmax(deltas)
+        if accept_step(deltas[channel], self.temperature):
+            self.current_solution.set_channel(channel, self._proposals[channel])
+            self.current_value += deltas[channel]
+            self._mode_sums[:] = self._sweep_sums[channel]
+            self._update_best()
             return True
         return False
 
-    def solve(self: "MetaModeSolver", n_steps: int, *, progress: bool = True) -> None:
+    def _update_best(self: "MetaModeSolver") -> None:
+        """Copy the current solution to the best if it is an improvement."""
+        if self.current_value > self.best_value:
+            np.copyto(
+                self.best_solution.permuted_modes,
+                self.current_solution.permuted_modes,
+            )
+            np.copyto(self.best_solution.flat_perm, self.current_solution.flat_perm)
+            self.best_value = self.current_value
+            if self._tqdm is not None:
+                self._tqdm.set_postfix(best_value=self.best_value)
+
+    def solve(
+        self: "MetaModeSolver",
+        n_steps: int,
+        *,
+        progress: bool = True,
+        batch_size: int = 1000,
+    ) -> None:
         """Solve the problem.
 
         Parameters
@@ -95,18 +238,246 @@ class MetaModeSolver:
             The number of steps to take.
         progress : bool
             Whether to show a progress bar.
+        batch_size : int
+            The number of single-channel steps taken in compiled code between
+            progress updates. Sweep steps are always taken one at a time, and
+            their permutations are copied to `steps` in chunks of this size.
+            The current value is recalculated from scratch every ``batch_size``
+            steps so that rounding errors do not accumulate.
         """
-        self._tqdm = trange(n_steps, disable=not progress)
-        for _ in self._tqdm:
-            accepted = self.step()
-            if accepted:
-                self.record.append((self._iteration, self.best_value))
-                self.steps.append(self.problem.generate(self.best_solution))
-            self._iteration += 1
+        batch_size = max(1, min(batch_size, n_steps))
+        iterations = np.empty(n_steps, dtype=np.int64)
+        values = np.empty(n_steps)
+        perms = np.empty(
+            (
+                batch_size if self.record_history else 0,
+                *self.current_solution.permuted_modes.shape,
+            ),
+            dtype=np.int32,
+        )
+        self._tqdm = tqdm(total=n_steps, disable=not progress)
+        if self.sweep:
+            n_accepted = self._solve_sweep(
+                n_steps,
+                batch_size,
+                iterations,
+                values,
+                perms,
+            )
+        else:
+            n_accepted = self._solve_batched(
+                n_steps,
+                batch_size,
+                iterations,
+                values,
+                perms,
+            )
+        self._record_iters.append(iterations[:n_accepted])
+        self._record_values.append(values[:n_accepted])
 
         self._tqdm.close()
         self._tqdm = None
 
+    def _solve_sweep(
+        self: "MetaModeSolver",
+        n_steps: int,
+        batch_size: int,
+        iterations: np.ndarray,
+        values: np.ndarray,
+        perms: np.ndarray,
+    ) -> int:
+        """Take sweep steps one at a time.
+
+        Parameters
+        ----------
+        n_steps : int
+            The number of steps to take.
+        batch_size : int
+            The number of steps between recalculations of the current value.
+        iterations : np.ndarray
+            Filled with the iteration of each accepted step.
+        values : np.ndarray
+            Filled with the value after each accepted step.
+        perms : np.ndarray
+            A buffer for the permutation after each accepted step, copied to
+            `steps` whenever it is full. Empty unless `record_history` is set.
+
+        Returns
+        -------
+        int
+            The number of accepted steps.
+        """
+        n_accepted = 0
+        n_buffered = 0
+        for i in range(1, n_steps + 1):
+            if self.step():
+                iterations[n_accepted] = self._iteration
+                values[n_accepted] = self.current_value
+                n_accepted += 1
+                if self.record_history:
+                    perms[n_buffered] = self.current_solution.permuted_modes
+                    n_buffered += 1
+                    if n_buffered == len(perms):
+                        self._steps.append(perms.copy())
+                        n_buffered = 0
+            self._iteration += 1
+            self._tqdm.update()
+            if i % batch_size == 0:
+                self._refresh()
+        if n_buffered:
+            self._steps.append(perms[:n_buffered].copy())
+        return n_accepted
+
+    def _solve_batched(
+        self: "MetaModeSolver",
+        n_steps: int,
+        batch_size: int,
+        iterations: np.ndarray,
+        values: np.ndarray,
+        perms: np.ndarray,
+    ) -> int:
+        """Take single-channel steps in batches of compiled code.
+
+        Parameters
+        ----------
+        n_steps : int
+            The number of steps to take.
+        batch_size : int
+            The maximum number of steps in each batch.
+        iterations : np.ndarray
+            Filled with the iteration of each accepted step.
+        values : np.ndarray
+            Filled with the value after each accepted step.
+        perms : np.ndarray
+            A buffer for the permutation after each accepted step in a batch.
+            Empty unless `record_history` is set.
+
+        Returns
+        -------
+        int
+            The number of accepted steps.
+        """
+        n_accepted = 0
+        while n_steps > 0:
+            batch = min(batch_size, n_steps)
+            self.current_value, self.best_value, n_batch = self.problem.anneal(
+                solution=self.current_solution,
+                sums=self._mode_sums,
+                value=self.current_value,
+                best_solution=self.best_solution,
+                best_value=self.best_value,
+                temperature=self.temperature,
+                n_steps=batch,
+                iterations=iterations[n_accepted:],
+                values=values[n_accepted:],
+                perms=perms,
+                record_history=self.record_history,
+            )
+            iterations[n_accepted : n_accepted + n_batch] += self._iteration
+            self._refresh()
+            if self.record_history:
+                self._steps.append(perms[:n_batch].copy())
+            n_accepted += n_batch
+            self._iteration += batch
+            n_steps -= batch
+            self._tqdm.update(batch)
+            self._tqdm.set_postfix(best_value=self.best_value)
+        return n_accepted
+
+    def advance(
+        self: "MetaModeSolver",
+        n_steps: int,
+        *,
+        batch_size: int = 1000,
+    ) -> None:
+        """Take steps without recording them or showing progress.
+
+        Only the current and best solutions are updated, so this can be
+        called repeatedly without growing `record_iters`, `record_values` or
+        `steps`.
+
+        Parameters
+        ----------
+        n_steps : int
+            The number of steps to take.
+        batch_size : int
+            The number of steps between recalculations of the current value.
+        """
+        batch_size = max(1, min(batch_size, n_steps))
+        if len(self._batch_iterations) < batch_size:
+            self._batch_iterations = np.empty(batch_size, dtype=np.int64)
+            self._batch_values = np.empty(batch_size)
+        for start in range(0, n_steps, batch_size):
+            batch = min(batch_size, n_steps - start)
+            if self.sweep:
+                for _ in range(batch):
+                    self.step()
+            else:
+                self.current_value, self.best_value, _ = self.problem.anneal(
+                    solution=self.current_solution,
+                    sums=self._mode_sums,
+                    value=self.current_value,
+                    best_solution=self.best_solution,
+                    best_value=self.best_value,
+                    temperature=self.temperature,
+                    n_steps=batch,
+                    iterations=self._batch_iterations,
+                    values=self._batch_values,
+                    perms=self._batch_perms,
+                    record_history=False,
+                )
+            self._refresh()
+        self._iteration += n_steps
+
+    def _refresh(self: "MetaModeSolver") -> None:
+        """Recalculate the current mode sums and value from scratch.
+
+        Incremental updates accumulate rounding error, which is largest with
+        a float32 correlation matrix.
+        """
+        self._mode_sums[:] = self.problem.mode_sums(self.current_solution)
+        self.current_value = self.problem.evaluate(self.current_solution)
+        self._update_best()
+
+    @property
+    def record_iters(self: "MetaModeSolver") -> np.ndarray:
+        """The iteration of each accepted step.
+
+        Returns
+        -------
+        np.ndarray
+            An int64 array of shape (n_accepted,).
+        """
+        if len(self._record_iters) > 1:
+            self._record_iters = [np.concatenate(self._record_iters)]
+        return self._record_iters[0]
+
+    @property
+    def record_values(self: "MetaModeSolver") -> np.ndarray:
+        """The value after each accepted step.
+
+        Returns
+        -------
+        np.ndarray
+            A float64 array of shape (n_accepted,).
+        """
+        if len(self._record_values) > 1:
+            self._record_values = [np.concatenate(self._record_values)]
+        return self._record_values[0]
+
+    @property
+    def steps(self: "MetaModeSolver") -> np.ndarray:
+        """The permutation after each accepted step.
+
+        Returns
+        -------
+        np.ndarray
+            An array of shape (n_accepted, n_channels, n_modes).
+        """
+        if len(self._steps) > 1:
+            self._steps = [np.concatenate(self._steps)]
+        return self._steps[0]
+
     def get_solution(self: "MetaModeSolver") -> MetaModeSolution:
         """Get the best solution.
 
@@ -136,3 +507,23 @@ class MetaModeSolver:
             A set of covariance matrices.
         """
         return self.problem.generate(solution=self.best_solution)
+
+    def materialize_step(self: "MetaModeSolver", i: int) -> np.ndarray:
+        """Generate the set of covariance matrices for a recorded step.
+
+        Parameters
+        ----------
+        i : int
+            The index of the step in `steps`.
+
+        Returns
+        -------
+        np.ndarray
+            A set of covariance matrices.
+        """
+        solution = MetaModeSolution(
+            n_modes=self.problem.n_modes,
+            n_channels=self.problem.n_channels,
+            permutation=self.steps[i],
+        )
+        return self.problem.generate(solution=solution)
@@ -0,0 +1,243 @@
+"""A parallel tempering solver for the meta-modes annealing algorithm."""
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from tqdm.auto import trange
+
+from annealing.metamodes.problem import MetaModeProblem
+from annealing.metamodes.solution import MetaModeSolution
+from annealing.metamodes.solver import MetaModeSolver
+
+rng = np.random.default_rng()
+
+
+def _advance(chain: MetaModeSolver, n_steps: int) -> MetaModeSolver:
+    """Take a number of steps on a single chain.
+
+    Parameters
+    ----------
+    chain : MetaModeSolver
+        The chain to advance.
+    n_steps : int
+        The number of steps to take.
+
+    Returns
+    -------
+    MetaModeSolver
+        The advanced chain.
+    """
+    chain.advance(n_steps)
+    return chain
+
+
+class ParallelTemperingSolver:
+    """Run solvers at several temperatures and swap solutions between them.
+
+    Attributes
+    ----------
+    problem : MetaModeProblem
+        The problem shared by every chain.
+    chains : list[MetaModeSolver]
+        One solver per temperature, ordered as ``temperatures``.
+    temperatures : list[float]
+        The temperature ladder.
+    swap_interval : int
+        The number of steps each chain takes between swap attempts.
+    n_workers : int
+        The number of threads used to advance the chains.
+    best_solution : MetaModeSolution
+        The best solution found by any chain.
+    best_value : float
+        The value of the best solution found so far.
+    n_swaps : int
+        The number of accepted swaps.
+    record_iters : np.ndarray
+        The iteration at the end of each round in which a new best value was
+        found.
+    record_values : np.ndarray
+        The best value at each iteration in `record_iters`.
+    """
+
+    def __init__(
+        self: "ParallelTemperingSolver",
+        correlation_matrix: np.ndarray,
+        n_modes: int,
+        n_channels: int,
+        objective: str,
+        temperatures: Sequence[float],
+        *,
+        swap_interval: int = 100,
+        n_workers: int | None = None,
+        dtype: np.dtype | type = np.float64,
+        symmetric: bool | None = None,
+    ) -> None:
+        """Initialize a ParallelTemperingSolver object.
+
+        Parameters
+        ----------
+        correlation_matrix : np.ndarray
+            The correlation matrix.
+        n_modes : int
+            The number of modes.
+        n_channels : int
+            The number of channels.
+        objective : str
+            The objective function to evaluate.
+        temperatures : Sequence[float]
+            The temperature of each chain. All must be positive.
+        swap_interval : int
+            The number of steps each chain takes between swap attempts.
+        n_workers : int, optional
+            The number of threads used to advance the chains, by default
+            one per chain.
+        dtype : np.dtype or type
+            The dtype used to store the correlation matrix, by default float64.
+        symmetric : bool, optional
+            Whether the correlation matrix is symmetric. By default, this is
+            checked.
+
+        Raises
+        ------
+        ValueError
+            If there are no temperatures, any is not positive, or the swap
+            interval is not positive.
+        """
+        if len(temperatures) == 0 or min(temperatures) <= 0:
+            msg = "Parallel tempering requires one or more positive temperatures."
+            raise ValueError(msg)
+        if swap_interval <= 0:
+            msg = f"swap_interval must be positive, got {swap_interval}"
+            raise ValueError(msg)
+
+        self.temperatures = sorted(temperatures)
+        self.problem = MetaModeProblem(
+            correlation_matrix=correlation_matrix,
+            n_modes=n_modes,
+            n_channels=n_channels,
+            objective=objective,
+            dtype=dtype,
+            symmetric=symmetric,
+        )
+        self.chains = [
+            MetaModeSolver(
+                problem=self.problem,
+                temperature=temperature,
+                record_history=False,
+            )
+            for temperature in self.temperatures
+        ]
+        self.swap_interval = swap_interval
+        self.n_workers = n_workers or len(self.chains)
+
+        best = max(self.chains, key=lambda chain: chain.best_value)
+        self.best_solution = best.best_solution.copy()
+        self.best_value = best.best_value
+        self.n_swaps = 0
+        self._iteration = 0
+
+        self._record_iters = []
+        self._record_values = []
+
+    def _swap(self: "ParallelTemperingSolver") -> None:
+        """Attempt a Metropolis swap between each pair of neighbouring chains."""
+        for i in range(len(self.chains) - 1):
+            cold, hot = self.chains[i], self.chains[i + 1]
+            log_p = (1 / cold.temperature - 1 / hot.temperature) * (
+                hot.current_value - cold.current_value
+            )
+            if log_p >= 0 or rng.random() < np.exp(log_p):
+                cold.temperature, hot.temperature = hot.temperature, cold.temperature
+                self.chains[i], self.chains[i + 1] = hot, cold
+                self.n_swaps += 1
+
+    def _update_best(self: "ParallelTemperingSolver") -> None:
+        """Keep a copy of the best solution found by any chain."""
+        best = max(self.chains, key=lambda chain: chain.best_value)
+        if best.best_value > self.best_value:
+            self.best_solution = best.best_solution.copy()
+            self.best_value = best.best_value
+            self._record_iters.append(self._iteration)
+            self._record_values.append(self.best_value)
+
+    def solve(
+        self: "ParallelTemperingSolver",
+        n_steps: int,
+        *,
+        progress: bool = True,
+    ) -> None:
+        """Solve the problem.
+
+        Parameters
+        ----------
+        n_steps : int
+            The number of steps each chain takes.
+        progress : bool
+            Whether to show a progress bar.
+        """
+        n_rounds = -(-n_steps // self.swap_interval)
+        pbar = trange(n_rounds, disable=not progress)
+        with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+            for _ in pbar:
+                chunk = min(self.swap_interval, n_steps)
+                n_steps -= chunk
+                list(pool.map(_advance, self.chains, [chunk] * len(self.chains)))
+                self._iteration += chunk
+                self._update_best()
+                self._swap()
+                pbar.set_postfix(best_value=self.best_value)
+
+        pbar.close()
+
+    @property
+    def record_iters(self: "ParallelTemperingSolver") -> np.ndarray:
+        """The iteration of each new best value.
+
+        Returns
+        -------
+        np.ndarray
+            An int64 array of shape (n_improvements,).
+        """
+        return np.array(self._record_iters, dtype=np.int64)
+
+    @property
+    def record_values(self: "ParallelTemperingSolver") -> np.ndarray:
+        """Each new best value.
+
+        Returns
+        -------
+        np.ndarray
+            A float64 array of shape (n_improvements,).
+        """
+        return np.array(self._record_values, dtype=np.float64)
+
+    def get_solution(self: "ParallelTemperingSolver") -> MetaModeSolution:
+        """Get the best solution.
+
+        Returns
+        -------
+        MetaModeSolution
+            The best solution.
+        """
+        return self.best_solution
+
+    def get_value(self: "ParallelTemperingSolver") -> float:
+        """Get the value of the best solution.
+
+        Returns
+        -------
+        float
+            The value of the best solution.
+        """
+        return self.best_value
+
+    def generate(self: "ParallelTemperingSolver") -> np.ndarray:
+        """Generate a set of covariance matrices from the best solution.
+
+        Returns
+        -------
+        np.ndarray
+            A set of covariance matrices.
+        """
+        return self.problem.generate(solution=self.best_solution)
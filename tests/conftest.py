@@ -0,0 +1,50 @@
+"""Shared fixtures for the metamodes tests."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture()
+def n_modes() -> int:
+    """The number of modes in the test problems."""
+    return 4
+
+
+@pytest.fixture()
+def n_channels() -> int:
+    """The number of channels in the test problems."""
+    return 5
+
+
+@pytest.fixture()
+def rng() -> np.random.Generator:
+    """A seeded random number generator."""
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(params=[True, False], ids=["symmetric", "non-symmetric"])
+def correlation_matrix(
+    request: pytest.FixtureRequest,
+    rng: np.random.Generator,
+    n_modes: int,
+    n_channels: int,
+) -> np.ndarray:
+    """An exactly symmetric or a non-symmetric correlation matrix."""
+    size = n_modes * n_channels
+    matrix = rng.standard_normal((size, size))
+    if request.param:
+        matrix = (matrix + matrix.T) / 2
+    np.fill_diagonal(matrix, 1)
+    return matrix
+
+
+@pytest.fixture(params=["SUM", "ABS_SUM"])
+def objective(request: pytest.FixtureRequest) -> str:
+    """The name of an objective."""
+    return request.param
+
+
+@pytest.fixture(params=[np.float64, np.float32], ids=["float64", "float32"])
+def dtype(request: pytest.FixtureRequest) -> type:
+    """A supported correlation matrix dtype."""
+    return request.param
@@ -0,0 +1,266 @@
+"""Tests for the meta-modes problem and its compiled kernels."""
+
+import numpy as np
+import pytest
+
+from annealing.metamodes.objectives import Objective, _delta_mode_sums
+from annealing.metamodes.problem import MetaModeProblem
+from annealing.metamodes.solution import MetaModeSolution
+
+
+def reference_value(
+    matrix: np.ndarray,
+    permuted_modes: np.ndarray,
+    *,
+    absolute: bool,
+) -> float:
+    """Evaluate an objective by fancy indexing, as the original implementation."""
+    n_channels, n_modes = permuted_modes.shape
+    perm = permuted_modes + np.arange(n_channels)[:, None] * n_modes
+    ret = 0.0
+    for i in range(n_modes):
+        total = matrix[perm[:, i]][:, perm[:, i]].sum()
+        ret += abs(total) if absolute else total
+    return ret - n_modes * n_channels
+
+
+def reference_generate(matrix: np.ndarray, permuted_modes: np.ndarray) -> np.ndarray:
+    """Generate correlation matrices by fancy indexing, as the original code."""
+    n_channels, n_modes = permuted_modes.shape
+    perm = permuted_modes + np.arange(n_channels)[:, None] * n_modes
+    perm = matrix[perm][:, :, perm]
+    return np.diagonal(perm, axis1=1, axis2=3).T
+
+
+def tolerance(dtype: type) -> dict[str, float]:
+    """Comparison tolerances for values computed from a matrix of ``dtype``."""
+    if dtype == np.float32:
+        return {"rtol": 1e-5, "atol": 1e-4}
+    return {"rtol": 1e-10, "atol": 1e-10}
+
+
+@pytest.fixture()
+def problem(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    dtype: type,
+    n_modes: int,
+    n_channels: int,
+) -> MetaModeProblem:
+    """A problem for every objective, symmetry and dtype."""
+    return MetaModeProblem(
+        correlation_matrix=correlation_matrix,
+        n_modes=n_modes,
+        n_channels=n_channels,
+        objective=objective,
+        dtype=dtype,
+    )
+
+
+@pytest.fixture()
+def solution(n_modes: int, n_channels: int) -> MetaModeSolution:
+    """A random solution."""
+    return MetaModeSolution(n_modes=n_modes, n_channels=n_channels).random_permutation()
+
+
+def test_evaluate_matches_reference(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+) -> None:
+    """The compiled objective matches the fancy-indexing reference."""
+    expected = reference_value(
+        problem.correlation_matrix.astype(np.float64),
+        solution.permuted_modes,
+        absolute=problem.objective is Objective.ABS_SUM,
+    )
+    np.testing.assert_allclose(
+        problem.evaluate(solution),
+        expected,
+        **tolerance(problem.correlation_matrix.dtype),
+    )
+
+
+def test_mode_sums_match_generate(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+) -> None:
+    """Each mode sum is the sum of the corresponding generated matrix."""
+    np.testing.assert_allclose(
+        problem.mode_sums(solution),
+        problem.generate(solution).sum(axis=(1, 2), dtype=np.float64),
+        **tolerance(problem.correlation_matrix.dtype),
+    )
+
+
+def test_generate_matches_reference(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+) -> None:
+    """The gather kernel reproduces the original diagonal construction."""
+    generated = problem.generate(solution)
+    assert generated.dtype == problem.correlation_matrix.dtype
+    np.testing.assert_array_equal(
+        generated,
+        reference_generate(problem.correlation_matrix, solution.permuted_modes),
+    )
+
+
+def test_symmetry_is_detected_exactly(
+    correlation_matrix: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Only an exactly symmetric matrix takes the symmetric path."""
+    problem = MetaModeProblem(correlation_matrix, n_modes, n_channels, "SUM")
+    assert problem.symmetric == np.array_equal(correlation_matrix, correlation_matrix.T)
+
+    perturbed = correlation_matrix.copy()
+    perturbed[0, 1] += 1e-12
+    problem = MetaModeProblem(perturbed, n_modes, n_channels, "SUM")
+    assert not problem.symmetric
+
+
+def test_symmetric_path_matches_general_path(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    solution: MetaModeSolution,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Forcing the general path on a symmetric matrix gives the same values."""
+    symmetric = (correlation_matrix + correlation_matrix.T) / 2
+    fast = MetaModeProblem(symmetric, n_modes, n_channels, objective)
+    general = MetaModeProblem(
+        symmetric,
+        n_modes,
+        n_channels,
+        objective,
+        symmetric=False,
+    )
+    assert fast.symmetric
+    np.testing.assert_allclose(fast.evaluate(solution), general.evaluate(solution))
+    np.testing.assert_allclose(fast.mode_sums(solution), general.mode_sums(solution))
+
+
+def test_delta_mode_sums(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """The incremental mode sums match a full recalculation."""
+    sums = problem.mode_sums(solution)
+    new_solution = solution.copy().permute_one_channel(2)
+    new_sums = np.empty_like(sums)
+    _delta_mode_sums(
+        problem.correlation_matrix,
+        problem._correlation_matrix_t,
+        solution.flat_perm,
+        2,
+        new_solution.flat_perm[2],
+        sums,
+        new_sums,
+        n_modes,
+        n_channels,
+    )
+    np.testing.assert_allclose(
+        new_sums,
+        problem.mode_sums(new_solution),
+        **tolerance(problem.correlation_matrix.dtype),
+    )
+
+
+def test_delta_evaluate(problem: MetaModeProblem, solution: MetaModeSolution) -> None:
+    """The change in value matches the difference of full evaluations."""
+    sums = problem.mode_sums(solution)
+    new_sums = np.empty_like(sums)
+    new_solution = solution.copy()
+    channel = new_solution.permute_random_channel()
+    delta = problem.delta_evaluate(solution, new_solution, channel, sums, new_sums)
+    np.testing.assert_allclose(
+        delta,
+        problem.evaluate(new_solution) - problem.evaluate(solution),
+        **tolerance(problem.correlation_matrix.dtype),
+    )
+    np.testing.assert_allclose(
+        new_sums,
+        problem.mode_sums(new_solution),
+        **tolerance(problem.correlation_matrix.dtype),
+    )
+
+
+def test_sweep_evaluate(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+    rng: np.random.Generator,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Each channel's proposal is scored as if it were applied on its own."""
+    proposals = rng.permuted(solution.permuted_modes, axis=1)
+    flat_proposals = np.empty_like(proposals)
+    sums = problem.mode_sums(solution)
+    new_sums = np.empty((n_channels, n_modes))
+    deltas = problem.sweep_evaluate(solution, proposals, flat_proposals, sums, new_sums)
+    value = problem.evaluate(solution)
+    for channel in range(n_channels):
+        proposed = solution.copy().set_channel(channel, proposals[channel])
+        np.testing.assert_allclose(
+            deltas[channel],
+            problem.evaluate(proposed) - value,
+            **tolerance(problem.correlation_matrix.dtype),
+        )
+        np.testing.assert_allclose(
+            new_sums[channel],
+            problem.mode_sums(proposed),
+            **tolerance(problem.correlation_matrix.dtype),
+        )
+
+
+@pytest.mark.parametrize("temperature", [0.0, 1.0])
+def test_anneal(
+    problem: MetaModeProblem,
+    solution: MetaModeSolution,
+    temperature: float,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """The batch kernel keeps its running value, sums and best consistent."""
+    n_steps = 200
+    sums = problem.mode_sums(solution)
+    value = problem.evaluate(solution)
+    best_solution = solution.copy()
+    iterations = np.empty(n_steps, dtype=np.int64)
+    values = np.empty(n_steps)
+    perms = np.empty((n_steps, n_channels, n_modes), dtype=np.int32)
+    value, best_value, n_accepted = problem.anneal(
+        solution,
+        sums,
+        value,
+        best_solution,
+        value,
+        temperature,
+        n_steps,
+        iterations,
+        values,
+        perms,
+    )
+    tol = tolerance(problem.correlation_matrix.dtype)
+    np.testing.assert_allclose(value, problem.evaluate(solution), **tol)
+    np.testing.assert_allclose(sums, problem.mode_sums(solution), **tol)
+    np.testing.assert_allclose(best_value, problem.evaluate(best_solution), **tol)
+    np.testing.assert_array_equal(
+        solution.flat_perm,
+        solution.permuted_modes + np.arange(n_channels)[:, None] * n_modes,
+    )
+    assert best_value >= values[:n_accepted].max(initial=-np.inf)
+    assert np.all(np.diff(iterations[:n_accepted]) > 0)
+    if temperature == 0:
+        assert np.all(np.diff(values[:n_accepted]) > 0)
+    else:
+        # A random start can be a local optimum at zero temperature.
+        assert n_accepted > 0
+    if n_accepted:
+        np.testing.assert_array_equal(perms[n_accepted - 1], solution.permuted_modes)
+        recorded = MetaModeSolution(n_modes, n_channels, permutation=perms[0])
+        np.testing.assert_allclose(values[0], problem.evaluate(recorded), **tol)
@@ -0,0 +1,256 @@
+"""Tests for the meta-modes solvers."""
+
+import numpy as np
+import pytest
+
+from annealing.metamodes.solver import MetaModeSolver
+from annealing.metamodes.tempering import ParallelTemperingSolver
+
+
+@pytest.mark.parametrize("sweep", [False, True], ids=["single", "sweep"])
+@pytest.mark.parametrize("temperature", [0.0, 0.5])
+def test_solve(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    sweep: bool,
+    temperature: float,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Solving keeps the current and best values consistent with evaluate."""
+    solver = MetaModeSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        objective,
+        temperature=temperature,
+        sweep=sweep,
+    )
+    solver.solve(300, progress=False, batch_size=64)
+    solver.solve(100, progress=False, batch_size=64)
+    problem = solver.problem
+
+    np.testing.assert_allclose(
+        solver.current_value,
+        problem.evaluate(solver.current_solution),
+    )
+    np.testing.assert_allclose(
+        solver.get_value(),
+        problem.evaluate(solver.get_solution()),
+    )
+    assert solver.best_value >= solver.current_value
+    assert solver.best_value >= solver.record_values.max(initial=-np.inf)
+
+    assert solver.record_iters.dtype == np.int64
+    assert np.all(np.diff(solver.record_iters) > 0)
+    assert np.all(solver.record_iters < 400)
+    assert len(solver.steps) == len(solver.record_values)
+    # A random start can be a local optimum at zero temperature.
+    if len(solver.steps):
+        np.testing.assert_array_equal(
+            solver.materialize_step(-1),
+            problem.generate(solver.current_solution),
+        )
+    if temperature == 0:
+        assert np.all(np.diff(solver.record_values) > 0)
+        np.testing.assert_allclose(solver.best_value, solver.current_value)
+
+
+@pytest.mark.parametrize("sweep", [False, True], ids=["single", "sweep"])
+def test_value_is_recalculated_each_batch(
+    correlation_matrix: np.ndarray,
+    sweep: bool,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Rounding errors in the incremental updates do not accumulate."""
+    solver = MetaModeSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        "ABS_SUM",
+        dtype=np.float32,
+        temperature=5.0,
+        sweep=sweep,
+    )
+    solver.solve(400, progress=False, batch_size=100)
+    assert solver.current_value == solver.problem.evaluate(solver.current_solution)
+    np.testing.assert_array_equal(
+        solver._mode_sums,
+        solver.problem.mode_sums(solver.current_solution),
+    )
+
+
+@pytest.mark.parametrize("sweep", [False, True], ids=["single", "sweep"])
+def test_record_history_off(
+    correlation_matrix: np.ndarray,
+    sweep: bool,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Without history the values are recorded but the permutations are not."""
+    solver = MetaModeSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        "SUM",
+        temperature=0.5,
+        sweep=sweep,
+        record_history=False,
+    )
+    solver.solve(200, progress=False)
+    assert len(solver.record_values) > 0
+    assert solver.steps.shape == (0, n_channels, n_modes)
+
+
+@pytest.mark.parametrize("sweep", [False, True], ids=["single", "sweep"])
+def test_advance(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    sweep: bool,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Advancing updates the solutions without recording the steps."""
+    solver = MetaModeSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        objective,
+        temperature=0.5,
+        sweep=sweep,
+    )
+    solver.advance(250, batch_size=100)
+    np.testing.assert_allclose(
+        solver.current_value,
+        solver.problem.evaluate(solver.current_solution),
+    )
+    np.testing.assert_allclose(
+        solver.best_value,
+        solver.problem.evaluate(solver.best_solution),
+    )
+    assert solver.best_value >= solver.current_value
+    assert len(solver.record_values) == 0
+    assert len(solver.steps) == 0
+
+
+def test_step_matches_evaluate(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Single steps taken from Python track the value."""
+    solver = MetaModeSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        objective,
+        temperature=0.5,
+    )
+    for _ in range(100):
+        solver.step()
+    np.testing.assert_allclose(
+        solver.current_value,
+        solver.problem.evaluate(solver.current_solution),
+    )
+    np.testing.assert_allclose(
+        solver.best_value,
+        solver.problem.evaluate(solver.best_solution),
+    )
+
+
+def test_parallel_tempering(
+    correlation_matrix: np.ndarray,
+    objective: str,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """The chains share one problem and the best solution is kept."""
+    solver = ParallelTemperingSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        objective,
+        [1.0, 0.1, 0.5],
+        swap_interval=25,
+    )
+    solver.solve(200, progress=False)
+
+    assert solver.temperatures == [0.1, 0.5, 1.0]
+    assert sorted(chain.temperature for chain in solver.chains) == solver.temperatures
+    assert all(chain.problem is solver.problem for chain in solver.chains)
+    assert all(len(chain.steps) == 0 for chain in solver.chains)
+    assert all(len(chain.record_values) == 0 for chain in solver.chains)
+    np.testing.assert_allclose(
+        solver.get_value(),
+        solver.problem.evaluate(solver.get_solution()),
+    )
+    assert solver.best_value == max(chain.best_value for chain in solver.chains)
+    assert solver.record_iters.dtype == np.int64
+    assert len(solver.record_iters) == len(solver.record_values)
+    assert np.all(np.diff(solver.record_values) > 0)
+    if len(solver.record_values):
+        assert solver.record_values[-1] == solver.best_value
+
+
+@pytest.mark.parametrize(
+    ("temperatures", "swap_interval", "match"),
+    [
+        ([0, 1], 100, "positive temperatures"),
+        ([], 100, "positive temperatures"),
+        ([1], 0, "swap_interval"),
+    ],
+)
+def test_parallel_tempering_validates_arguments(
+    correlation_matrix: np.ndarray,
+    temperatures: list[float],
+    swap_interval: int,
+    match: str,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """Invalid temperatures and swap intervals are rejected."""
+    with pytest.raises(ValueError, match=match):
+        ParallelTemperingSolver(
+            correlation_matrix,
+            n_modes,
+            n_channels,
+            "SUM",
+            temperatures,
+            swap_interval=swap_interval,
+        )
+
+
+def test_parallel_tempering_forwards_problem_options(
+    correlation_matrix: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """The shared problem is built with the given dtype and symmetry."""
+    solver = ParallelTemperingSolver(
+        correlation_matrix,
+        n_modes,
+        n_channels,
+        "SUM",
+        [1],
+        dtype=np.float32,
+        symmetric=False,
+    )
+    assert solver.problem.correlation_matrix.dtype == np.float32
+    assert not solver.problem.symmetric
+
+
+def test_solver_accepts_existing_problem(
+    correlation_matrix: np.ndarray,
+    n_modes: int,
+    n_channels: int,
+) -> None:
+    """A solver can share a problem but not also redefine it."""
+    problem = MetaModeSolver(correlation_matrix, n_modes, n_channels, "SUM").problem
+    solver = MetaModeSolver(problem=problem, temperature=0.5)
+    assert solver.problem is problem
+    with pytest.raises(ValueError, match="not both"):
+        MetaModeSolver(correlation_matrix, problem=problem)
+    with pytest.raises(ValueError, match="existing problem"):
+        MetaModeSolver(correlation_matrix, n_modes, n_channels)